@@ -1,10 +1,14 @@
 import streamlit as st
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.axes import Axes
+import numpy as np
 import random
+from typing import Tuple
 
 # Import your core logic
 import parsing
-from route_representation import generate_kilter_board_layout, Route
+from route_representation import generate_kilter_board_layout, Route, Board
 from route_generator import GeneticRouteGenerator
 
 # --- SETUP & CONFIG ---
@@ -17,48 +21,67 @@ if 'board' not in st.session_state:
     st.session_state['population'] = []
     st.session_state['generation_count'] = 0
 
+# Reusable thumbnail figures: 12 for the route grid, the last one for the elite route.
+# Plain Figures (not pyplot) so they stay out of pyplot's global figure registry.
+if 'fig_pool' not in st.session_state:
+    st.session_state['fig_pool'] = []
+    for _ in range(13):
+        fig = Figure(figsize=(2.5, 3.5))
+        st.session_state['fig_pool'].append((fig, fig.subplots()))
+
 # --- HELPER: DRAWING ---
-def draw_route_thumbnail(route: Route, board_data: dict) -> plt.Figure:
+@st.cache_resource
+def get_background_image(_board: Board) -> np.ndarray:
+    """
+    Renders the static ghost holds once as an RGBA image covering the
+    thumbnail's plot limits, so each thumbnail only has to blit it.
+    """
+    fig = plt.figure(figsize=(2.5, 2.5))
+    fig.patch.set_alpha(0.0)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.scatter(_board.xs, _board.ys, c='grey', s=5, alpha=0.3)
+    ax.set_xlim(-0.1, 1.1)
+    ax.set_ylim(-0.1, 1.1)
+    ax.axis('off')
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return image
+
+def draw_route_thumbnail(route: Route, board: Board, fig_ax: Tuple[Figure, Axes]) -> Figure:
     """
-    Draws a simplified view of the route using Kilter board color standards.
+    Draws a simplified view of the route using Kilter board color standards,
+    reusing the given figure and axes from the thumbnail pool.
     """
-    fig, ax = plt.subplots(figsize=(2.5, 3.5)) 
+    fig, ax = fig_ax
+    ax.clear()
     
     # 1. Draw Background (Ghost Holds)
-    all_x = [h.x for h in board_data.values()]
-    all_y = [h.y for h in board_data.values()]
-    ax.scatter(all_x, all_y, c='grey', s=5, alpha=0.3, zorder=1)
+    ax.imshow(get_background_image(board), extent=[-0.1, 1.1, -0.1, 1.1], zorder=1)
     
     # 2. Draw Connections (The Flow)
-    r_coords = route.get_coordinates()
+    r_coords = route.get_coordinates(board)
     
     # Draw path line (simple dashed line)
     ax.plot(r_coords['x'], r_coords['y'], c='#00AAAA', lw=3, alpha=0.6, linestyle='--', zorder=2)
     
-    # 3. Draw Route Holds (The Kilter Colors)
-    starts = route.start_holds
-    top = route.top_hold
+    # 3. Draw Route Holds (The Kilter Colors) in a single scatter call
+    holds = np.asarray(route.holds, dtype=int)
+    is_start = np.isin(holds, route.start_holds)
+    is_top = (holds == route.top_hold) & ~is_start
     
-    for hid in route.holds:
-        h = board_data[hid]
-        color = '#00FFFF'  # Cyan for mid-holds
-        size = 150 * h.size
-        
-        if hid in starts:
-            color = '#00FF00' # Green for Start
-            size = 180 * h.size
-        elif hid == top:
-            color = '#FF00FF' # Magenta for Finish
-            size = 180 * h.size
-        
-        ax.scatter(h.x, h.y, c=color, s=size, edgecolors='black', linewidths=1.5, zorder=4)
+    # Green for Start, Magenta for Finish, Cyan for mid-holds
+    colors = np.where(is_start, '#00FF00', np.where(is_top, '#FF00FF', '#00FFFF'))
+    sizes = np.where(is_start | is_top, 180, 150) * board.sizes[holds]
+    
+    ax.scatter(board.xs[holds], board.ys[holds], c=colors, s=sizes, edgecolors='black', linewidths=1.5, zorder=4)
 
     # Final plot cleanup
     ax.set_xlim(-0.1, 1.1)
     ax.set_ylim(-0.1, 1.1)
     ax.set_aspect('equal', adjustable='box')
     ax.axis('off')
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 # --- SIDEBAR: INPUTS ---
@@ -83,7 +106,7 @@ for option in style_options:
 
 # Calculate parameters
 difficulty_val = parsing.parse_difficulty(diff_input.split(" ")[0])
-style_params = parsing.parse_style(active_styles) # Pass list of active styles
+style_params = parsing.parse_style(tuple(active_styles)) # Pass active styles (hashable, for caching)
 
 st.sidebar.write("---")
 
@@ -118,23 +141,28 @@ else:
         
         # Display Grid of Routes (4 columns)
         cols = st.columns(4)
-        selected_indices = []
         
         display_limit = 12 
+        n_display = min(len(pop), display_limit)
         
-        for i in range(min(len(pop), display_limit)):
+        for i in range(n_display):
             route = pop[i]
             
             with cols[i % 4]:
-                fig = draw_route_thumbnail(route, st.session_state['board'])
-                st.pyplot(fig)
-                
-                # Display the current length of the route for visibility
-                st.caption(f"Holds: {len(route.holds)}") 
+                fig = draw_route_thumbnail(route, st.session_state['board'], st.session_state['fig_pool'][i])
+                st.pyplot(fig, clear_figure=False)
                 
-                # Checkbox for user selection (Human Boost)
-                if st.checkbox(f"Keep Route {i+1}", key=f"c_{st.session_state['generation_count']}_{i}"):
-                    selected_indices.append(i)
+                # Display the route number and current length for visibility
+                st.caption(f"Route {i+1} | Holds: {len(route.holds)}") 
+        
+        # One selection widget for all routes (Human Boost)
+        selected = st.multiselect(
+            "Keep routes:",
+            options=list(range(1, n_display + 1)),
+            format_func=lambda n: f"Route {n}",
+            key=f"sel_{st.session_state['generation_count']}"
+        )
+        selected_indices = [n - 1 for n in selected]
         
         st.write("---")
         evolve_btn = st.form_submit_button("🧬 Evolve Next Generation (Breed Selected Routes)", type="primary", use_container_width=True)
@@ -161,6 +189,6 @@ else:
         st.markdown("---")
         st.subheader("Current Elite Route")
         best_route = st.session_state['population'][0] 
-        best_fig = draw_route_thumbnail(best_route, st.session_state['board'])
-        st.pyplot(best_fig)
+        best_fig = draw_route_thumbnail(best_route, st.session_state['board'], st.session_state['fig_pool'][-1])
+        st.pyplot(best_fig, clear_figure=False)
         st.markdown(f"**Length:** **{len(best_route.holds)}** moves.")
\ No newline at end of file
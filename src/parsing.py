@@ -1,5 +1,6 @@
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Tuple
 
 # Using the V-Scale and FB-Scale dictionaries implied by your previous code snippets
 V_SCALE = {
@@ -23,9 +24,15 @@ FB_SCALE = {
     "8C": 0.98, "8C+": 1.00
 }
 
-def parse_style(active_styles: List[str]) -> Dict:
+# Compiled once at import rather than on every parse
+_V_RE = re.compile(r"V(\d+)")
+_RANGE_RE = re.compile(r"^([^-]*)-([^-]*)$")
+
+@lru_cache(maxsize=64)
+def parse_style(active_styles: Tuple[str, ...]) -> Dict:
     """
-    Parses a list of active style keywords into style parameters for the GA.
+    Parses a tuple of active style keywords into style parameters for the GA.
+    Results are cached, so the returned dict is shared and must not be mutated.
     """
     
     # --- DEFAULT PARAMETERS ---
@@ -63,6 +70,7 @@ def parse_style(active_styles: List[str]) -> Dict:
              
     return params
 
+@lru_cache(maxsize=128)
 def parse_difficulty(diff_input: str) -> float:
     """
     Convert a user difficulty input ('V4', '6B+', 'soft 7A') 
@@ -79,7 +87,7 @@ def parse_difficulty(diff_input: str) -> float:
     text = text.replace("SOFT", "").replace("HARD", "").strip()
 
     # Detect V-scale
-    v_match = re.match(r"V(\d+)", text)
+    v_match = _V_RE.match(text)
     if v_match:
         grade = "V" + v_match.group(1)
         if grade in V_SCALE:
@@ -97,13 +105,12 @@ def parse_difficulty(diff_input: str) -> float:
         return max(0.0, min(1.0, base))
 
     # Handle ranges (e.g., "V3-V5")
-    if "-" in text:
-        parts = text.split("-")
-        if len(parts) == 2:
-            val1 = parse_difficulty(parts[0])
-            val2 = parse_difficulty(parts[1])
-            # Return the average of the range
-            return (val1 + val2) / 2.0
+    range_match = _RANGE_RE.match(text)
+    if range_match:
+        val1 = parse_difficulty(range_match.group(1))
+        val2 = parse_difficulty(range_match.group(2))
+        # Return the average of the range
+        return (val1 + val2) / 2.0
             
     # Default to V5 equivalent if parsing fails
     return 0.45
\ No newline at end of file
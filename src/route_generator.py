@@ -1,32 +1,152 @@
 import random
-import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import parsing # Need this import for _mutate
-from typing import List, Dict
-from route_representation import Route, Hold
+from typing import List, Dict, Optional, Tuple
+from route_representation import Route, Board
+
+def _fitness_core(ids: np.ndarray, lens: np.ndarray, D: np.ndarray, ys: np.ndarray,
+                  reach_min: float, reach_max: float, variance_penalty: float,
+                  target_dist: float, target_len: int) -> np.ndarray:
+    """
+    Machine fitness of every route in a padded id matrix (see RoutePopulation),
+    computed from the board's distance matrix and y coordinates in one pass.
+    """
+    lens = lens.astype(np.int64)
+    n_moves = lens - 1
+    rows = np.arange(len(lens))
+    
+    # Padding ids (-1) still index the board, their moves are masked out below
+    move_from = ids[:, :-1]
+    move_to = ids[:, 1:]
+    valid = np.arange(ids.shape[1] - 1) < n_moves[:, None]
+    
+    # All move distances in one gather from the precomputed distance matrix
+    dists = np.where(valid, D[move_from, move_to], 0.0)
+    
+    score = np.full(len(lens), 0.5)
+    
+    # 1. Analyze Move Distances and Vertical Progress
+    score -= 0.1 * np.count_nonzero(valid & (ys[move_to] < ys[move_from] - 0.05), axis=1)
+    score -= 0.05 * np.count_nonzero(valid & ((dists < reach_min) | (dists > reach_max)), axis=1)
+    
+    # 2. Style Consistency (Variance)
+    avg_dist = dists.sum(axis=1) / np.maximum(n_moves, 1)
+    score -= np.abs(avg_dist - target_dist) * variance_penalty * 0.1
+    
+    # 3. Reward Total Vertical Gain
+    score += (ys[ids[rows, np.maximum(n_moves, 0)]] - ys[ids[:, 0]]) * 0.1
+    
+    # 4. Penalty for being too short/long relative to target difficulty
+    score -= np.abs(lens - target_len) * 0.05
+    
+    score = np.clip(score, 0.0, 1.0)
+    score[lens < 3] = 0.0
+    return score
+
+
+# Board arrays held by each fitness worker process, set once by the pool initializer
+_worker_D = None
+_worker_ys = None
+
+def _init_fitness_worker(D: np.ndarray, ys: np.ndarray) -> None:
+    global _worker_D, _worker_ys
+    _worker_D = D
+    _worker_ys = ys
+
+def _fitness_worker(job: Tuple[np.ndarray, np.ndarray, dict, int]) -> np.ndarray:
+    ids, lens, style, target_len = job
+    return _fitness_core(
+        ids, lens, _worker_D, _worker_ys,
+        style["reach_min"], style["reach_max"], style["variance_penalty"],
+        style.get("avg_move_dist", 0.18), target_len
+    )
+
+
+class RoutePopulation:
+    """
+    A whole generation stored as one padded matrix of hold ids (-1 past the
+    end of each route) plus a vector of route lengths. Indexing returns a
+    Route for the display code.
+    """
+    def __init__(self, pop_size: int, max_len: int):
+        self.ids = np.full((pop_size, max_len), -1, dtype=np.int16)
+        self.lens = np.zeros(pop_size, dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.lens)
+
+    def __getitem__(self, i: int) -> Route:
+        return Route(holds=self.row(i).tolist())
+
+    def row(self, i: int) -> np.ndarray:
+        """View of the hold ids of route i."""
+        return self.ids[i, :self.lens[i]]
+
+    def set_row(self, i: int, route_ids: List[int]) -> None:
+        self.ids[i] = -1
+        self.ids[i, :len(route_ids)] = route_ids
+        self.lens[i] = len(route_ids)
+
 
 class GeneticRouteGenerator:
-    def __init__(self, hold_dataset: Dict[int, Hold]):
-        self.holds = hold_dataset
+    def __init__(self, board: Board, workers: Optional[int] = None):
+        self.board = board
         self.population_size = 24  
         self.mutation_rate = 0.2
-        self.holds_map = self.holds # Alias for clarity
+        self.workers = workers
+
+        # Longest route init_population can produce (max target length + 2).
+        # Crossover never outgrows a parent and 'add' mutations stop at 16.
+        self.max_route_len = max(16, self._get_target_length(1.0) + 2)
+
+        # Board arrays used by the vectorized hot paths. Hold ids run 0..N-1
+        # (see generate_kilter_board_layout), so an id doubles as an index.
+        self._ids = board.ids
+        self._xs = board.xs
+        self._ys = board.ys
+        self._rng = np.random.default_rng()
+
+        # Pairwise hold offsets and distances (_dy[i, j] = y_j - y_i). The board
+        # never changes, so every distance query after this is a lookup.
+        # Reach checks use the squared distances; the real distances are only
+        # needed by the fitness (mean move length).
+        dx = self._xs[None, :] - self._xs[:, None]
+        self._dy = self._ys[None, :] - self._ys[:, None]
+        self._D2 = dx*dx + self._dy*self._dy
+        self._D = np.sqrt(self._D2)
+
+        # Start holds in the bottom quarter of the board, found once instead of per route
+        self._start_holds = self._ids[self._ys < 0.25]
+
+        # Reachable-hold lists per (reach_min, reach_max), filled lazily by _adjacency
+        self._adjacency_cache: Dict[Tuple[float, float], List[np.ndarray]] = {}
+
+        # Optional process pool for fitness evaluation, kept alive across generations.
+        # Scoring is cheap, so this only pays off for large populations.
+        self._pool = None
+        if workers is not None and workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_fitness_worker,
+                initargs=(self._D, self._ys)
+            )
         
-    def init_population(self, difficulty: float, style: dict) -> List[Route]:
+    def init_population(self, difficulty: float, style: dict) -> RoutePopulation:
         """
         Creates the first generation. Each route's length is randomized 
         around a target based on the input difficulty.
         """
-        pop = []
-        for _ in range(self.population_size):
-            
-            target_base_len = self._get_target_length(difficulty)
+        pop = RoutePopulation(self.population_size, self.max_route_len)
+        target_base_len = self._get_target_length(difficulty)
+        
+        for i in range(self.population_size):
             
             # Introduce +/- 2 moves variation to ensure different starting lengths
             route_len = max(4, target_base_len + random.randint(-2, 2)) 
             
             route_ids = self._create_random_route_ids(route_len, style)
-            r = Route(holds=route_ids, hold_objects=self.holds_map)
-            pop.append(r)
+            pop.set_row(i, route_ids)
         return pop
     
     def _get_target_length(self, difficulty: float) -> int:
@@ -41,112 +161,97 @@ class GeneticRouteGenerator:
         return base_length + int(difficulty * max_increase)
 
     # ... (evolve method remains largely the same) ...
-    def evolve(self, current_pop: List[Route], favorites_indices: List[int], difficulty: float, style: dict) -> List[Route]:
+    def evolve(self, current_pop: RoutePopulation, favorites_indices: List[int], difficulty: float, style: dict) -> RoutePopulation:
         """
         The main GA evolution step: Selection -> Crossover -> Mutation.
         """
         # 1. Calculate Hybrid Fitness (Machine + Human)
+        if self._pool is not None:
+            # Each worker scores one block of population rows
+            target_len = self._get_target_length(difficulty)
+            block = -(-len(current_pop) // self.workers)
+            jobs = [
+                (current_pop.ids[s:s + block], current_pop.lens[s:s + block], style, target_len)
+                for s in range(0, len(current_pop), block)
+            ]
+            machine_scores = np.concatenate(list(self._pool.map(_fitness_worker, jobs)))
+        else:
+            machine_scores = self._machine_fitness(current_pop, style, difficulty)
+        
         scored_pop = []
-        for i, route in enumerate(current_pop):
-            m_fitness = self._machine_fitness(route, style, difficulty)
+        for i in range(len(current_pop)):
+            m_fitness = machine_scores[i]
             human_boost = 1.0 if i in favorites_indices else 0.0
             A = 0.7 
             C = 0.3 
             total_score = (A * human_boost) + (C * m_fitness)
-            scored_pop.append((route, total_score))
+            scored_pop.append((i, total_score))
             
         scored_pop.sort(key=lambda x: x[1], reverse=True)
         
         # 2. Selection (Elitism)
-        next_gen = []
+        next_gen = RoutePopulation(self.population_size, self.max_route_len)
         elite_size = 4
+        n_elite = min(elite_size, len(scored_pop))
         
-        for i in range(min(elite_size, len(scored_pop))):
-            next_gen.append(scored_pop[i][0])
+        for child in range(n_elite):
+            src = scored_pop[child][0]
+            next_gen.ids[child] = current_pop.ids[src]
+            next_gen.lens[child] = current_pop.lens[src]
         
         # 3. Crossover and Mutation
-        pool = [x[0] for x in scored_pop[:12]]
+        pool = np.array([x[0] for x in scored_pop[:12]])
+        
+        # Binary tournament selection, two parents per child. The pool is sorted
+        # best-first, so the lower of two random pool positions wins.
+        n_children = self.population_size - n_elite
+        winners = self._rng.integers(0, len(pool), size=(n_children, 2, 2)).min(axis=2)
         
-        while len(next_gen) < self.population_size:
-            p1 = random.choice(pool)
-            p2 = random.choice(pool)
+        for child, (w1, w2) in zip(range(n_elite, self.population_size), winners):
+            p1 = pool[w1]
+            p2 = pool[w2]
             
-            child_ids = self._crossover(p1.holds, p2.holds)
+            self._crossover(current_pop, p1, p2, next_gen, child)
             
             if random.random() < self.mutation_rate:
-                child_ids = self._mutate(child_ids, style)
-                
-            child = Route(holds=child_ids, hold_objects=self.holds_map)
-            next_gen.append(child)
+                self._mutate(next_gen, child, style)
             
         return next_gen
 
 
-    def _machine_fitness(self, route: Route, style: dict, difficulty: float) -> float:
-        # ... (fitness logic remains the same) ...
-        if len(route.holds) < 3: return 0.0
-        
-        score = 0.5
-        dists = []
-        vertical_gain = route.hold_objects[route.holds[-1]].y - route.hold_objects[route.holds[0]].y
-        
-        # 1. Analyze Move Distances and Vertical Progress
-        for i in range(len(route.holds) - 1):
-            h1 = self.holds[route.holds[i]]
-            h2 = self.holds[route.holds[i+1]]
-            d = math.sqrt((h1.x - h2.x)**2 + (h1.y - h2.y)**2)
-            dists.append(d)
-            
-            if h2.y < h1.y - 0.05: score -= 0.1
-            if d < style["reach_min"] or d > style["reach_max"]: score -= 0.05
-                
-        # 2. Style Consistency (Variance)
-        if dists:
-            avg_dist = sum(dists) / len(dists)
-            target = style.get("avg_move_dist", 0.18)
-            score -= abs(avg_dist - target) * style["variance_penalty"] * 0.1
-        
-        # 3. Reward Total Vertical Gain
-        score += vertical_gain * 0.1 
-
-        # 4. Penalty for being too short/long relative to target difficulty
-        target_len = self._get_target_length(difficulty)
-        length_deviation = abs(len(route.holds) - target_len)
-        score -= length_deviation * 0.05 
-
-        return max(0.0, min(1.0, score))
+    def _machine_fitness(self, pop: RoutePopulation, style: dict, difficulty: float) -> np.ndarray:
+        return _fitness_core(
+            pop.ids, pop.lens, self._D, self._ys,
+            style["reach_min"], style["reach_max"], style["variance_penalty"],
+            style.get("avg_move_dist", 0.18), self._get_target_length(difficulty)
+        )
 
     def _create_random_route_ids(self, length: int, style: dict) -> List[int]:
         # Start at bottom quarter of the board
-        start_holds = [h for h, obj in self.holds_map.items() if obj.y < 0.25]
-        if not start_holds: return []
+        if len(self._start_holds) == 0: return []
         
-        current = random.choice(start_holds)
+        current = int(self._rng.choice(self._start_holds))
         route = [current]
         
+        # Resolve the style's adjacency lists once, not per move
+        adjacency = self._adjacency(style)
+        
         for _ in range(length - 1):
-            possible = self._get_reachable_holds(current, style)
+            possible = adjacency[current]
             
-            if not possible: break
+            if len(possible) == 0: break
             
             # --- START OF FIX: STOCHASTIC SELECTION ---
             
             # 1. Calculate weights: Higher Y-value = higher weight
-            hold_weights = []
-            current_y = self.holds_map[current].y
+            # Progress is difference in Y. Max progress is 1.0 (normalized)
+            progress = self._ys[possible] - self._ys[current]
             
-            for hid in possible:
-                h = self.holds_map[hid]
-                
-                # Progress is difference in Y. Max progress is 1.0 (normalized)
-                progress = h.y - current_y 
-                
-                # Weight = Base (0.5) + Progress bonus (0 to 0.5). Ensures variety but rewards upward movement.
-                weight = 0.5 + max(0, progress * 2.0)
-                hold_weights.append(weight)
+            # Weight = Base (0.5) + Progress bonus (0 to 0.5). Ensures variety but rewards upward movement.
+            hold_weights = 0.5 + np.maximum(0, progress * 2.0)
 
             # 2. Select next hold using calculated weights
-            nxt = random.choices(possible, weights=hold_weights, k=1)[0]
+            nxt = int(self._rng.choice(possible, p=hold_weights / hold_weights.sum()))
             # --- END OF FIX ---
 
             route.append(nxt)
@@ -154,61 +259,72 @@ class GeneticRouteGenerator:
             
         return route
 
+    def _adjacency(self, style: dict) -> List[np.ndarray]:
+        """
+        Reachable hold ids for every hold on the board under the style's reach
+        bounds. The board is static and there are only a few style presets,
+        so each adjacency list is computed once and reused.
+        """
+        key = (round(style["reach_min"], 3), round(style["reach_max"], 3))
+        adjacency = self._adjacency_cache.get(key)
+        if adjacency is None:
+            # Row i of the mask holds the Distance and Vertical Progress Check from hold i,
+            # on squared distances. Allow small downward moves (-0.05 normalized)
+            min_dist = style["reach_min"]
+            max_dist = style["reach_max"]
+            mask = (self._D2 > min_dist*min_dist) & (self._D2 < max_dist*max_dist) & (self._dy > -0.05)
+            adjacency = [self._ids[row] for row in mask]
+            self._adjacency_cache[key] = adjacency
+        return adjacency
+
     def _get_reachable_holds(self, current_id: int, style: dict) -> List[int]:
-        curr = self.holds_map[current_id]
-        candidates = []
-        
-        min_dist = style["reach_min"]
-        max_dist = style["reach_max"]
-        
-        for hid, h in self.holds_map.items():
-            if hid == current_id: continue
-            
-            dx = h.x - curr.x
-            dy = h.y - curr.y
-            dist = math.sqrt(dx*dx + dy*dy)
-            
-            # Distance and Vertical Progress Check
-            # Allow small downward moves (-0.05 normalized)
-            if min_dist < dist < max_dist and dy > -0.05: 
-                candidates.append(hid)
-                    
-        return candidates
-
-    def _mutate(self, route_ids: List[int], style: dict) -> List[int]:
-        """Performs a random mutation: nudge, add, or remove a hold."""
-        if len(route_ids) < 3: return route_ids
+        return self._adjacency(style)[current_id].tolist()
+
+    def _mutate(self, pop: RoutePopulation, i: int, style: dict) -> None:
+        """Performs a random mutation in place on route i: nudge, add, or remove a hold."""
+        row = pop.ids[i]
+        length = int(pop.lens[i])
+        if length < 3: return
         
         mutation_type = random.choice(['nudge', 'nudge', 'add', 'remove'])
         
         if mutation_type == 'nudge':
-            idx = random.randint(1, len(route_ids)-2) 
-            prev_id = route_ids[idx-1]
+            idx = random.randint(1, length-2) 
+            prev_id = int(row[idx-1])
             neighbors = self._get_reachable_holds(prev_id, style)
             if neighbors:
-                route_ids[idx] = random.choice(neighbors)
+                row[idx] = random.choice(neighbors)
                 
         elif mutation_type == 'add':
-            if len(route_ids) < 16:
-                idx = random.randint(1, len(route_ids)-1)
-                h1_id = route_ids[idx-1]
+            if length < 16:
+                idx = random.randint(1, length-1)
+                h1_id = int(row[idx-1])
                 
                 possible_inserts = self._get_reachable_holds(h1_id, style)
                 
                 if possible_inserts:
-                    new_hold = random.choice(possible_inserts)
-                    route_ids.insert(idx, new_hold)
+                    # Shift the tail right by one and insert
+                    row[idx+1:length+1] = row[idx:length]
+                    row[idx] = random.choice(possible_inserts)
+                    pop.lens[i] = length + 1
                 
         elif mutation_type == 'remove':
-            if len(route_ids) > 4: 
-                idx = random.randint(1, len(route_ids)-2)
-                route_ids.pop(idx)
-            
-        return route_ids
-
-    def _crossover(self, p1: List[int], p2: List[int]) -> List[int]:
-        if len(p1) < 2 or len(p2) < 2: return p1 
-        min_len = min(len(p1), len(p2))
-        cut_point = random.randint(1, min_len - 1) 
-        child = p1[:cut_point] + p2[cut_point:]
-        return child
\ No newline at end of file
+            if length > 4: 
+                idx = random.randint(1, length-2)
+                # Shift the tail left by one over the removed hold
+                row[idx:length-1] = row[idx+1:length]
+                row[length-1] = -1
+                pop.lens[i] = length - 1
+
+    def _crossover(self, parents: RoutePopulation, p1: int, p2: int, children: RoutePopulation, child: int) -> None:
+        """Writes the crossover of parent rows p1 and p2 into row `child`."""
+        len1 = int(parents.lens[p1])
+        len2 = int(parents.lens[p2])
+        if len1 < 2 or len2 < 2:
+            children.ids[child] = parents.ids[p1]
+            children.lens[child] = len1
+            return
+        cut_point = random.randint(1, min(len1, len2) - 1) 
+        children.ids[child, :cut_point] = parents.ids[p1, :cut_point]
+        children.ids[child, cut_point:len2] = parents.ids[p2, cut_point:len2]
+        children.lens[child] = len2
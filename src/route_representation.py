@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from functools import cache
+from typing import List, Optional, Dict, NamedTuple
+import math
+import numpy as np
+
+@dataclass
+class Hold:
+    id: int
+    x: float       # 0.0 to 1.0 (normalized width)
+    y: float       # 0.0 to 1.0 (normalized height)
+    orientation: float # 0 to 360 degrees (0 = Up) - simplified for this model
+    size: float    # 0.0 (tiny crimp) to 1.0 (huge jug)
+
+@dataclass(slots=True)
+class Route:
+    holds: List[int]                       # Sequence of hold IDs
+    parent_id: Optional[str] = None        # To track lineage for fitness boosting
+    
+    @property
+    def start_holds(self) -> List[int]:
+        """First 2 holds are usually starts, or just the first one."""
+        return self.holds[:2] if len(self.holds) >= 2 else self.holds[:1]
+
+    @property
+    def top_hold(self) -> Optional[int]:
+        return self.holds[-1] if self.holds else None
+
+    def get_coordinates(self, board: "Board") -> Dict[str, List[float]]:
+        """Helper for plotting."""
+        xs = board.xs[self.holds].tolist()
+        ys = board.ys[self.holds].tolist()
+        return {"x": xs, "y": ys}
+
+class Board(NamedTuple):
+    """
+    Struct-of-arrays board layout. Entry i of every array describes the hold
+    with id i.
+    """
+    ids: np.ndarray           # int32 hold ids, 0..N-1
+    xs: np.ndarray            # 0.0 to 1.0 (normalized width)
+    ys: np.ndarray            # 0.0 to 1.0 (normalized height)
+    orientations: np.ndarray  # 0 to 360 degrees (0 = Up)
+    sizes: np.ndarray         # 0.0 (tiny crimp) to 1.0 (huge jug)
+
+    def hold(self, hold_id: int) -> Hold:
+        """Single hold view, for display code."""
+        return Hold(
+            id=int(self.ids[hold_id]),
+            x=float(self.xs[hold_id]),
+            y=float(self.ys[hold_id]),
+            orientation=float(self.orientations[hold_id]),
+            size=float(self.sizes[hold_id])
+        )
+
+@cache
+def generate_kilter_board_layout() -> Board:
+    """
+    Generates a 12x12 staggered grid approximation of a Kilter Board.
+    Rows are offset to create triangles.
+    The layout is built once; every call returns the same read-only Board.
+    """
+    rows = 12
+    cols = 12
+    
+    # Hold ids run row by row from the bottom-left corner
+    r = np.repeat(np.arange(rows), cols)
+    c = np.tile(np.arange(cols), rows)
+    
+    # Kilter rows are staggered. 
+    # Odd rows are shifted right by 0.5 units
+    x_pos = c + 0.5 * (r % 2)
+    y_pos = r * 1.0
+    
+    # Heuristic: Lower holds are bigger (feet), higher are crimpier
+    # This is a simplification. Real board data is a static JSON.
+    sizes = np.where(r < 3, 1.0, 0.4)
+    
+    # Normalize to 0.0 - 1.0 relative to board size
+    board = Board(
+        ids=np.arange(rows * cols, dtype=np.int32),
+        xs=x_pos / 12.0,
+        ys=y_pos / 12.0,
+        orientations=np.zeros(rows * cols), # Placeholder
+        sizes=sizes
+    )
+    
+    # The cached board is shared by every caller
+    for arr in board:
+        arr.setflags(write=False)
+    return board